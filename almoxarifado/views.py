@@ -29,6 +29,23 @@ from gestao_membros.models import Departamento
 from thefuzz import process
 import threading
 
+def gerar_qr_base64(url):
+    """
+    Renderiza o QR Code em PNG na memória e devolve em base64.
+    A imagem e o buffer são liberados logo após o uso, o que importa na
+    impressão em lote de todas as etiquetas.
+    """
+    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    qr.add_data(url)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    try:
+        with BytesIO() as buffer:
+            img.save(buffer, format="PNG")
+            return base64.b64encode(buffer.getvalue()).decode()
+    finally:
+        img.get_image().close()
+
 def get_lideres_almoxarifado():
     return Membro.objects.filter(departamentos_liderados__nome__icontains='almoxarifado')
 
@@ -506,22 +523,10 @@ def imprimir_etiqueta_qr(request, item_id):
 
     from django.urls import reverse
     url_retirar = request.build_absolute_uri(reverse('qr_retirar_item', kwargs={'item_id': item.id_unico}))
-    qr_ret = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr_ret.add_data(url_retirar)
-    qr_ret.make(fit=True)
-    img_ret = qr_ret.make_image(fill_color="black", back_color="white")
-    buf_ret = BytesIO()
-    img_ret.save(buf_ret, format="PNG")
-    qr_retirar_b64 = base64.b64encode(buf_ret.getvalue()).decode()
+    qr_retirar_b64 = gerar_qr_base64(url_retirar)
 
     url_devolver = request.build_absolute_uri(reverse('qr_devolver_item', kwargs={'item_id': item.id_unico}))
-    qr_dev = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr_dev.add_data(url_devolver)
-    qr_dev.make(fit=True)
-    img_dev = qr_dev.make_image(fill_color="black", back_color="white")
-    buf_dev = BytesIO()
-    img_dev.save(buf_dev, format="PNG")
-    qr_devolver_b64 = base64.b64encode(buf_dev.getvalue()).decode()
+    qr_devolver_b64 = gerar_qr_base64(url_devolver)
 
     import os
     from django.conf import settings
@@ -545,22 +550,10 @@ def imprimir_todos_qrs(request):
     from django.urls import reverse
     for item in itens:
         url_retirar = request.build_absolute_uri(reverse('qr_retirar_item', kwargs={'item_id': item.id_unico}))
-        qr_ret = qrcode.QRCode(version=1, box_size=10, border=4)
-        qr_ret.add_data(url_retirar)
-        qr_ret.make(fit=True)
-        img_ret = qr_ret.make_image(fill_color="black", back_color="white")
-        buf_ret = BytesIO()
-        img_ret.save(buf_ret, format="PNG")
-        qr_retirar_b64 = base64.b64encode(buf_ret.getvalue()).decode()
+        qr_retirar_b64 = gerar_qr_base64(url_retirar)
 
         url_devolver = request.build_absolute_uri(reverse('qr_devolver_item', kwargs={'item_id': item.id_unico}))
-        qr_dev = qrcode.QRCode(version=1, box_size=10, border=4)
-        qr_dev.add_data(url_devolver)
-        qr_dev.make(fit=True)
-        img_dev = qr_dev.make_image(fill_color="black", back_color="white")
-        buf_dev = BytesIO()
-        img_dev.save(buf_dev, format="PNG")
-        qr_devolver_b64 = base64.b64encode(buf_dev.getvalue()).decode()
+        qr_devolver_b64 = gerar_qr_base64(url_devolver)
 
         itens_qr.append({
             'item': item,
@@ -10,17 +10,26 @@
 """
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 
 class EmailBackend(ModelBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
+        if not username:
+            return None
         UserModel = get_user_model()
-        try:
-            user = UserModel.objects.get(email__iexact=username)
-        except UserModel.DoesNotExist:
-            try:
-                user = UserModel.objects.get(username__iexact=username)
-            except UserModel.DoesNotExist:
-                return None
+        # Uma única consulta cobre e-mail e username; o e-mail tem prioridade.
+        # order_by('pk') torna determinística a escolha quando há e-mails repetidos
+        candidatos = UserModel.objects.filter(
+            Q(email__iexact=username) | Q(username__iexact=username)
+        ).order_by('pk')
+        user = None
+        for candidato in candidatos:
+            if (candidato.email or '').lower() == username.lower():
+                user = candidato
+                break
+            user = user or candidato
+        if user is None:
+            return None
         if user.check_password(password):
             return user
         return None
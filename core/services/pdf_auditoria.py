@@ -10,13 +10,6 @@
 """
 import io
 import json
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from django.utils import timezone
 
 def gerar_laudo_pericial_pdf(log):
@@ -24,6 +17,14 @@ def gerar_laudo_pericial_pdf(log):
     Gera um PDF forense baseado em um LogAuditoria.
     Retorna os bytes do PDF gerado.
     """
+    # ReportLab só é carregado quando um laudo é de fato gerado
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+
     buffer = io.BytesIO()
 
     # Configura documento PDF
@@ -0,0 +1,130 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, TestCase, override_settings
+from core import utils_forensics
+from core.backends import EmailBackend
+from core.models import LogAuditoria, Membro
+
+class EmailBackendTestCase(TestCase):
+    def setUp(self):
+        self.backend = EmailBackend()
+        self.membro = Membro.objects.create_user(username='joao', password='senha123', email='Joao@Teste.com')
+
+    def test_login_por_email_ignora_maiusculas(self):
+        user = self.backend.authenticate(None, username='joao@teste.com', password='senha123')
+        self.assertEqual(user, self.membro)
+
+    def test_login_por_username(self):
+        user = self.backend.authenticate(None, username='JOAO', password='senha123')
+        self.assertEqual(user, self.membro)
+
+    def test_senha_errada(self):
+        self.assertIsNone(self.backend.authenticate(None, username='joao', password='errada'))
+
+    def test_usuario_inexistente(self):
+        self.assertIsNone(self.backend.authenticate(None, username='ninguem', password='senha123'))
+
+    def test_email_tem_prioridade_sobre_username_de_outro_membro(self):
+        # O username de um membro coincide com o e-mail de outro: vale o e-mail
+        Membro.objects.create_user(username='maria@teste.com', password='outra123', email='maria.antiga@teste.com')
+        dona_email = Membro.objects.create_user(username='maria', password='senha123', email='maria@teste.com')
+
+        self.assertEqual(self.backend.authenticate(None, username='maria@teste.com', password='senha123'), dona_email)
+        self.assertIsNone(self.backend.authenticate(None, username='maria@teste.com', password='outra123'))
+
+    def test_email_repetido_usa_o_primeiro_cadastro(self):
+        duplicado = Membro.objects.create_user(username='joao2', password='senha456', email='joao@teste.com')
+
+        self.assertEqual(self.backend.authenticate(None, username='joao@teste.com', password='senha123'), self.membro)
+        self.assertIsNone(self.backend.authenticate(None, username='joao@teste.com', password='senha456'))
+        self.assertEqual(self.backend.authenticate(None, username='joao2', password='senha456'), duplicado)
+
+
+class ThreadAdiada:
+    """Substitui threading.Thread: guarda os workers para rodá-los no teste."""
+    criadas = []
+
+    def __init__(self, target, args=(), daemon=None):
+        self.target = target
+        self.args = args
+        ThreadAdiada.criadas.append(self)
+
+    def start(self):
+        pass
+
+    def run(self):
+        self.target(*self.args)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+@mock.patch('core.utils_forensics.connection')
+@mock.patch('core.utils_forensics.threading.Thread', ThreadAdiada)
+class RegistrarLogForenseGeoIPTestCase(TestCase):
+    IP = '200.100.50.25'
+
+    def setUp(self):
+        cache.clear()
+        ThreadAdiada.criadas = []
+        utils_forensics._geoip_pendentes.clear()
+        self.request = RequestFactory().get('/', REMOTE_ADDR=self.IP)
+        self.request.user = mock.Mock(is_authenticated=False)
+
+    def resposta_ip_api(self):
+        resp = mock.Mock(status_code=200)
+        resp.json.return_value = {
+            'status': 'success', 'city': 'Guarujá', 'region': 'SP', 'countryCode': 'BR', 'isp': 'Provedor'
+        }
+        return resp
+
+    def registrar(self, tabela='Teste'):
+        utils_forensics.registrar_log_forense(self.request, 'CREATE', tabela, '{}')
+        return LogAuditoria.objects.latest('pk')
+
+    def rodar_workers(self):
+        for thread in ThreadAdiada.criadas:
+            thread.run()
+
+    def test_log_desfeito_nao_dispara_worker(self, _connection):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.registrar()
+                    raise RuntimeError
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(ThreadAdiada.criadas, [])
+
+    @mock.patch('core.utils_forensics.requests.get')
+    def test_logs_do_mesmo_ip_usam_um_worker_e_uma_consulta(self, mock_get, _connection):
+        mock_get.return_value = self.resposta_ip_api()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            logs = [self.registrar(f'Tabela{i}') for i in range(3)]
+
+        self.assertEqual(len(ThreadAdiada.criadas), 1)
+        self.rodar_workers()
+
+        mock_get.assert_called_once()
+        for log in logs:
+            log.refresh_from_db()
+            self.assertEqual(log.cidade_origem, 'Guarujá - SP / BR')
+            self.assertEqual(log.isp_origem, 'Provedor')
+        self.assertEqual(utils_forensics._geoip_pendentes, {})
+
+    @mock.patch('core.utils_forensics.requests.get')
+    def test_falha_na_consulta_fica_em_cache(self, mock_get, _connection):
+        mock_get.side_effect = Exception('sem rede')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            primeiro = self.registrar()
+        self.rodar_workers()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            segundo = self.registrar()
+
+        mock_get.assert_called_once()
+        self.assertEqual(len(ThreadAdiada.criadas), 1)
+        primeiro.refresh_from_db()
+        self.assertEqual(primeiro.cidade_origem, utils_forensics.CIDADE_DESCONHECIDA)
+        self.assertEqual(segundo.cidade_origem, utils_forensics.CIDADE_DESCONHECIDA)
@@ -8,10 +8,24 @@
 * LOG DE ALTERAÇÕES:
 * - 16/06/2026 14:37: Auditoria e padronização global (Goal)
 """
+import threading
 import requests
+from django.core.cache import cache
+from django.db import connection, transaction
 from django.utils import timezone
 from core.models import LogAuditoria
 
+GEOIP_CACHE_TIMEOUT = 60 * 60 * 24
+# Falhas também vão para o cache, por pouco tempo, para não estourar o limite do IP-API
+GEOIP_FALHA_CACHE_TIMEOUT = 60 * 5
+CIDADE_DESCONHECIDA = 'Desconhecida'
+ISP_DESCONHECIDO = 'Desconhecido'
+
+# Logs aguardando GeoIP, agrupados por IP. Existe no máximo um worker por IP;
+# a entrada é removida quando o worker termina.
+_geoip_pendentes = {}
+_geoip_pendentes_lock = threading.Lock()
+
 def get_client_ip(request):
     x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
     if x_forwarded_for:
@@ -20,6 +34,82 @@ def get_client_ip(request):
         ip = request.META.get('REMOTE_ADDR')
     return ip
 
+def _ip_local(ip):
+    return not ip or ip in ['127.0.0.1', 'localhost']
+
+def _geoip_cache_key(ip):
+    return f'geoip_{ip}'
+
+def consultar_geoip(ip):
+    """
+    Retorna (cidade, isp) do IP. O resultado fica em cache, evitando uma
+    chamada HTTP ao IP-API a cada log gerado pelo mesmo endereço.
+    """
+    cidade = CIDADE_DESCONHECIDA
+    isp = ISP_DESCONHECIDO
+    if _ip_local(ip):
+        return cidade, isp
+
+    cache_key = _geoip_cache_key(ip)
+    cached = cache.get(cache_key)
+    if cached:
+        return cached
+
+    timeout = GEOIP_FALHA_CACHE_TIMEOUT
+    try:
+        # IP-API é público e não requer chave (limitado a 45 requisições por minuto)
+        resp = requests.get(f'http://ip-api.com/json/{ip}', timeout=1.5)
+        if resp.status_code == 200:
+            data = resp.json()
+            if data.get('status') == 'success':
+                cidade = f"{data.get('city', '')} - {data.get('region', '')} / {data.get('countryCode', '')}"
+                isp = data.get('isp', '')[:145]
+                timeout = GEOIP_CACHE_TIMEOUT
+    except Exception:
+        pass  # Failsafe: continua a gravar o log mesmo sem net
+
+    cache.set(cache_key, (cidade, isp), timeout=timeout)
+    return cidade, isp
+
+def _agendar_geoip(log_id, ip):
+    """
+    Coloca o log na fila do seu IP. Só dispara um worker se ainda não houver
+    um rodando para esse IP; caso contrário, o worker atual o atende.
+    """
+    with _geoip_pendentes_lock:
+        pendentes = _geoip_pendentes.get(ip)
+        if pendentes is not None:
+            pendentes.add(log_id)
+            return
+        _geoip_pendentes[ip] = {log_id}
+    threading.Thread(target=_preencher_geoip_async, args=(ip,), daemon=True).start()
+
+def _preencher_geoip_async(ip):
+    """
+    Worker de um IP: faz uma única consulta GeoIP e completa, em lote, todos os
+    logs pendentes desse IP, inclusive os que chegarem enquanto ele trabalha.
+    """
+    try:
+        cidade, isp = consultar_geoip(ip)
+        while True:
+            with _geoip_pendentes_lock:
+                pendentes = _geoip_pendentes[ip]
+                if not pendentes:
+                    del _geoip_pendentes[ip]
+                    return
+                _geoip_pendentes[ip] = set()
+            try:
+                LogAuditoria.objects.filter(pk__in=pendentes, cidade_origem__isnull=True).update(
+                    cidade_origem=cidade[:100], isp_origem=isp
+                )
+            except Exception:
+                pass
+    except Exception:
+        with _geoip_pendentes_lock:
+            _geoip_pendentes.pop(ip, None)
+    finally:
+        connection.close()
+
 def registrar_log_forense(request, acao, tabela, diff_json, usuario=None):
     """
     Registra um log na blockchain local (Zero-Trust) com captura avançada
@@ -34,29 +124,23 @@ def registrar_log_forense(request, acao, tabela, diff_json, usuario=None):
         user_agent = 'System Daemon / Background'
         usuario_acao = usuario
 
-    cidade = 'Desconhecida'
-    isp = 'Desconhecido'
-
-    # Busca GeoIP (Não falha se der erro de rede)
-    if ip and ip not in ['127.0.0.1', 'localhost']:
-        try:
-            # IP-API é público e não requer chave (limitado a 45 requisições por minuto)
-            resp = requests.get(f'http://ip-api.com/json/{ip}', timeout=1.5)
-            if resp.status_code == 200:
-                data = resp.json()
-                if data.get('status') == 'success':
-                    cidade = f"{data.get('city', '')} - {data.get('region', '')} / {data.get('countryCode', '')}"
-                    isp = data.get('isp', '')[:145]
-        except Exception:
-            pass  # Failsafe: continua a gravar o log mesmo sem net
-
-    LogAuditoria.objects.create(
+    # GeoIP: usa o cache se houver; senão grava o log já e completa a cidade em background
+    if _ip_local(ip):
+        cidade, isp = CIDADE_DESCONHECIDA, ISP_DESCONHECIDO
+    else:
+        cidade, isp = cache.get(_geoip_cache_key(ip)) or (None, None)
+
+    log = LogAuditoria.objects.create(
         usuario_acao=usuario_acao,
         acao_realizada=acao,
         tabela_afetada=tabela,
         ip_origem=ip,
-        cidade_origem=cidade[:100],
+        cidade_origem=cidade[:100] if cidade else None,
         isp_origem=isp,
         user_agent=user_agent,
         diferenca_json=diff_json
     )
+
+    if cidade is None:
+        # Só após o commit: antes disso o worker (outra conexão) não enxerga o log
+        transaction.on_commit(lambda: _agendar_geoip(log.pk, ip))
@@ -50,6 +50,9 @@ from django.utils import timezone
 import datetime
 from gestao_membros.models import AvisoMural
 
+# Senhas provisórias que obrigam a troca no primeiro acesso
+SENHAS_PADRAO = ('123456789', 'senha_padrao_mudar')
+
 
 def is_super_admin(user):
     return user.is_authenticated and (user.nivel_hierarquico == 'super_admin' or user.is_superuser)
@@ -64,11 +67,16 @@ def login_view(request):
 
         user = authenticate(request, username=username, password=password)
         if user is not None:
+            # A senha digitada já foi validada pelo authenticate; comparar com as
+            # senhas padrão dispensa dois hashes PBKDF2 extras a cada login
+            usa_senha_padrao = password in SENHAS_PADRAO
+
             from django_otp import devices_for_user
             devices = list(devices_for_user(user))
             if devices:
                 # User has MFA enabled!
                 request.session['mfa_pending_user_id'] = user.id
+                request.session['mfa_senha_padrao'] = usa_senha_padrao
                 # Enviar e-mail se for a unica opcao
                 email_devices = [d for d in devices if d.__class__.__name__ == 'EmailDevice']
                 if email_devices:
@@ -77,6 +85,7 @@ def login_view(request):
             else:
                 if getattr(user, 'mfa_obrigatorio', False):
                     request.session['mfa_pending_user_id'] = user.id
+                    request.session['mfa_senha_padrao'] = usa_senha_padrao
                     from django_otp.plugins.otp_email.models import EmailDevice
                     from django.contrib import messages
                     messages.warning(request, "Sua conta exige Autenticação de 2 Fatores (MFA). Um código foi enviado para seu e-mail.")
@@ -87,7 +96,7 @@ def login_view(request):
                     return redirect('mfa_challenge')
 
                 login(request, user)
-                if user.check_password('123456789') or user.check_password('senha_padrao_mudar'):
+                if usa_senha_padrao:
                     request.session['must_change_password'] = True
 
                 if not getattr(user, 'cpf', None) or not getattr(user, 'telefone', None) or not getattr(user, 'data_nascimento', None):
@@ -1017,7 +1026,7 @@ def forcar_troca_senha(request):
             messages.error(request, 'A nova senha deve ter pelo menos 8 caracteres.')
         elif nova_senha != confirmacao:
             messages.error(request, 'As senhas não coincidem.')
-        elif nova_senha in ['123456789', 'senha_padrao_mudar']:
+        elif nova_senha in SENHAS_PADRAO:
             messages.error(request, 'Você não pode usar uma senha padrão.')
         else:
             request.user.set_password(nova_senha)
@@ -1121,6 +1130,7 @@ def pesquisa_global_api(request):
         return render(request, 'core/partials/search_results.html', {'resultados': []})
 
     resultados = []
+    pode_editar_membros = request.user.nivel_hierarquico == 'super_admin'
 
     # 1. Pesquisa em Membros
     membros = Membro.objects.filter(
@@ -1132,7 +1142,7 @@ def pesquisa_global_api(request):
             'nome': m.get_full_name() or m.username,
             'icone': 'user',
             'url_ver': f"/membros/ver/{m.id}/",
-            'url_editar': f"/membros/editar/{m.id}/" if request.user.nivel_hierarquico in ['super_admin'] else None,
+            'url_editar': f"/membros/editar/{m.id}/" if pode_editar_membros else None,
         })
 
     # 2. Pesquisa em Departamentos e Avisos
@@ -1178,7 +1188,9 @@ def pesquisa_global_api(request):
     # 4. Pesquisa em Escalas
     try:
         from escalas.models import Escala
-        escalas = Escala.objects.filter(Q(membro_escalado__first_name__icontains=q) | Q(competencia__mes_ano__icontains=q))[:3]
+        escalas = Escala.objects.filter(
+            Q(membro_escalado__first_name__icontains=q) | Q(competencia__mes_ano__icontains=q)
+        ).select_related('membro_escalado')[:3]
         for e in escalas:
             resultados.append({
                 'tipo': 'Escala',
@@ -1635,7 +1647,7 @@ def mfa_challenge(request):
             login(request, user)
             del request.session['mfa_pending_user_id']
 
-            if user.check_password('123456789') or user.check_password('senha_padrao_mudar'):
+            if request.session.pop('mfa_senha_padrao', False):
                 request.session['must_change_password'] = True
 
             if not user.cpf or not user.telefone or not user.data_nascimento:
@@ -33,14 +33,6 @@ from intranet.services.gmail_service import enviar_email_html
 from intranet.services.whatsapp_service import enviar_whatsapp_template
 from .pdf_generator import gerar_pdf_competencia
 
-import openpyxl
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-import csv
-
 def is_lider(user):
     return user.nivel_hierarquico in ['super_admin', 'pastor_regente', 'pastor', 'missionario', 'lider', 'sub_lider']
 
@@ -1207,11 +1199,11 @@ def checkins_hoje_desktop(request):
         data_escala=hoje
     ).count()
 
-    todos_membros = []
-    for d in departamentos_liderados:
-        for m in d.membros_ativos.all():
-            if m not in todos_membros:
-                todos_membros.append(m)
+    # Uma consulta com DISTINCT no banco, em vez de carregar os membros de cada
+    # departamento e deduplicar por comparação em lista
+    todos_membros = Membro.objects.filter(
+        departamentos_ativos__in=departamentos_liderados
+    ).distinct().order_by('first_name', 'last_name')
 
     from escalas.models import CultoEvento
     dia_semana = hoje.weekday()
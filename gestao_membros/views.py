@@ -31,6 +31,7 @@ from django.core.mail import send_mail
 from .models import Departamento, Funcao, ConfiguracaoSlotEscala, AvisoMural, AvisoAnexo
 from core.models import Membro
 import csv
+from collections import Counter
 import openpyxl
 import datetime
 
@@ -156,16 +157,13 @@ def painel_lider(request):
                 departamento_alocado=departamento_ativo,
                 data_escala__lt=hoje,
                 status__in=['presente', 'falta_justificada', 'substituido', 'confirmado']
-            ).order_by('-data_escala')[:100]
+            ).order_by('-data_escala').values_list('status', flat=True)[:100]
 
-            total_avaliado = 0
-            presentes = 0
-            for e in ultimas_escalas:
-                # Se passou do dia e ficou 'confirmado', consideramos falta injustificada na matemática bruta,
-                # mas o status que marca presenca é 'presente'
-                total_avaliado += 1
-                if e.status in ['presente', 'substituido', 'falta_justificada']:
-                    presentes += 1
+            # Se passou do dia e ficou 'confirmado', consideramos falta injustificada na matemática bruta,
+            # mas o status que marca presenca é 'presente'
+            contagem_status = Counter(ultimas_escalas)
+            total_avaliado = sum(contagem_status.values())
+            presentes = sum(contagem_status[status] for status in ('presente', 'substituido', 'falta_justificada'))
 
             if total_avaliado > 0:
                 analytics['taxa_presenca'] = int((presentes / total_avaliado) * 100)
@@ -428,12 +426,24 @@ def exportar_aviso_pdf(request, aviso_id):
     from django.utils.html import strip_tags
     import textwrap
     text = strip_tags(aviso.mensagem)
+    linhas = textwrap.wrap(text, width=80)
+
+    # Um único text object por página em vez de um drawString por linha;
+    # o excedente continua nas páginas seguintes
     y_position = 8.5 * inch
-    for line in textwrap.wrap(text, width=80):
-        p.drawString(1 * inch, y_position, line)
-        y_position -= 0.25 * inch
+    while True:
+        capacidade = int((y_position - 1 * inch) / (0.25 * inch)) + 1
+        bloco, linhas = linhas[:capacidade], linhas[capacidade:]
+        texto = p.beginText(1 * inch, y_position)
+        texto.setFont("Helvetica", 12)
+        texto.setLeading(0.25 * inch)
+        texto.textLines(bloco)
+        p.drawText(texto)
+        p.showPage()
+        if not linhas:
+            break
+        y_position = 10.5 * inch
 
-    p.showPage()
     p.save()
     return response
 
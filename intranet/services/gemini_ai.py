@@ -10,11 +10,14 @@
 """
 import openpyxl
 import os
+import io
+import csv
 import json
 import tempfile
 import datetime
 from google import genai
 from django.conf import settings
+from intranet.services.planilhas import abrir_planilha_leitura
 
 def get_gemini_client():
     api_key = getattr(settings, 'GEMINI_API_KEY', '')
@@ -250,22 +253,14 @@ def analisar_planilha_importacao(file_obj, categorias=None):
     """
     client = get_gemini_client()
 
-    # 1. Carregar XLSX
-    wb = openpyxl.load_workbook(file_obj, data_only=True)
-    ws = wb.active
-
-    # 2. Converter para CSV/Texto em Memória
-    csv_str = ""
-    for row in ws.iter_rows(values_only=True):
-        row_str = []
-        for cell in row:
-            if cell is None:
-                row_str.append("")
-            else:
-                # Tratar strings e remover newlines
-                val = str(cell).replace('\n', ' ').replace('\r', '').replace(';', ',')
-                row_str.append(val)
-        csv_str += ";".join(row_str) + "\n"
+    # 1. Carregar XLSX e converter para CSV/Texto em Memória
+    # O módulo csv (em C) converte as células, trata None como vazio e coloca
+    # entre aspas os valores que contêm ';' ou quebras de linha
+    buffer_csv = io.StringIO()
+    with abrir_planilha_leitura(file_obj) as wb:
+        ws = wb.active
+        csv.writer(buffer_csv, delimiter=';', lineterminator='\n').writerows(ws.iter_rows(values_only=True))
+    csv_str = buffer_csv.getvalue()
 
     categorias_str = ""
     if categorias:
@@ -347,8 +342,9 @@ def gerar_planilha_sede_mensal(mes, ano):
     if not config or not config.planilha_padrao_sede:
         raise Exception("A planilha padrão da Sede não foi configurada. Acesse Configurações para anexá-la.")
 
-    lancamentos = Lancamento.objects.filter(data_vencimento__month=mes, data_vencimento__year=ano)
-    if not lancamentos.exists():
+    # Carregado uma única vez (com a categoria) e reaproveitado abaixo
+    lancamentos = list(Lancamento.objects.filter(data_vencimento__month=mes, data_vencimento__year=ano).select_related('categoria'))
+    if not lancamentos:
         raise Exception(f"Nenhum lançamento encontrado para o mês {mes}/{ano}.")
 
     # Prepara JSON simplificado dos lançamentos
@@ -11,10 +11,10 @@
 import os
 import json
 import tempfile
-import openpyxl
 import pdfplumber
 from groq import Groq
 from django.conf import settings
+from intranet.services.planilhas import abrir_planilha_leitura
 
 def obter_client_groq():
     api_key = getattr(settings, 'GROQ_API_KEY', '')
@@ -25,12 +25,12 @@ def obter_client_groq():
 def extrair_texto_arquivo(file_obj, extensao):
     texto_final = ""
     if extensao in ['.xlsx', '.xls']:
-        wb = openpyxl.load_workbook(file_obj, data_only=True)
-        for sheet in wb.worksheets:
-            for row in sheet.iter_rows(values_only=True):
-                row_str = " | ".join([str(v) for v in row if v is not None])
-                if row_str.strip():
-                    texto_final += row_str + ""
+        with abrir_planilha_leitura(file_obj) as wb:
+            for sheet in wb.worksheets:
+                for row in sheet.iter_rows(values_only=True):
+                    row_str = " | ".join([str(v) for v in row if v is not None])
+                    if row_str.strip():
+                        texto_final += row_str + ""
 
     elif extensao == '.csv':
         texto_final = file_obj.read().decode('utf-8', errors='ignore')
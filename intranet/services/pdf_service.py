@@ -9,7 +9,6 @@
 * - 16/06/2026 14:37: Auditoria e padronização global (Goal)
 """
 import io
-from xhtml2pdf import pisa
 
 def gerar_pdf(html_string, footer_text=None):
     """
@@ -19,6 +18,8 @@ def gerar_pdf(html_string, footer_text=None):
     if footer_text:
         html_string = html_string.replace('</body>', f'<div style="margin-top: 50px; text-align: center; font-size: 10px; color: #777;">{footer_text}</div></body>')
 
+    from xhtml2pdf import pisa
+
     buffer = io.BytesIO()
     pisa_status = pisa.CreatePDF(io.StringIO(html_string), dest=buffer)
 
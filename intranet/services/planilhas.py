@@ -0,0 +1,28 @@
+"""
+* PROJETO: Palavra de Vida Enseada - Intranet
+* ARQUIVO: intranet/services/planilhas.py
+* DESCRIÇÃO: Utilitários de leitura de planilhas XLSX
+* DEV: Marcos Roberto Lira (marcos@pvenseada.org)
+* VERSÃO: 0.0.1
+* DATA DA ÚLTIMA ALTERAÇÃO: 15/10/2026
+* LOG DE ALTERAÇÕES:
+* - 15/10/2026: Leitura de planilhas em modo streaming (read_only)
+"""
+from contextlib import contextmanager
+
+import openpyxl
+
+
+@contextmanager
+def abrir_planilha_leitura(arquivo):
+    """
+    Abre uma planilha apenas para leitura dos valores.
+    O modo read_only faz o openpyxl ler as linhas em streaming, sem montar
+    estilos nem objetos Cell completos. O workbook é sempre fechado ao sair,
+    pois nesse modo ele mantém o arquivo aberto.
+    """
+    wb = openpyxl.load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        yield wb
+    finally:
+        wb.close()
@@ -14,7 +14,6 @@ from .models import PermissaoPVDrive
 import zipfile
 from django.views.decorators.clickjacking import xframe_options_sameorigin
 from intranet.services.google_drive import get_drive_service
-from xhtml2pdf import pisa
 import urllib.parse
 from django.http import HttpResponse, JsonResponse
 from django.template.loader import render_to_string
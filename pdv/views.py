@@ -36,11 +36,13 @@ def pdv_login(request):
     if request.method == 'POST':
         try:
             data = json.loads(request.body)
-            pin = data.get('pin', '')
-            operador = OperadorCaixa.objects.filter(pin=pin, ativo=True).first()
-            if operador:
-                request.session['pdv_operador_id'] = operador.id
-                return JsonResponse({'success': True})
+            pin = str(data.get('pin', ''))
+            # PIN fora do formato nunca casa com um operador: dispensa a consulta
+            if len(pin) == 4 and pin.isdigit():
+                operador_id = OperadorCaixa.objects.filter(pin=pin, ativo=True).values_list('id', flat=True).first()
+                if operador_id:
+                    request.session['pdv_operador_id'] = operador_id
+                    return JsonResponse({'success': True})
             return JsonResponse({'success': False, 'message': 'PIN inválido.'})
         except Exception as e:
             return JsonResponse({'success': False, 'message': str(e)})
@@ -10,10 +10,6 @@
 """
 import json
 from django.utils.dateparse import parse_date
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
 import openpyxl
 from django.http import HttpResponse
 import csv
@@ -161,7 +157,7 @@ def exportar_relatorio(request):
     data_fim = request.GET.get('data_fim')
     formato = request.GET.get('formato', 'csv')
 
-    lancamentos = Lancamento.objects.filter(is_active=True).order_by('data_vencimento')
+    lancamentos = Lancamento.objects.filter(is_active=True).select_related('categoria').order_by('data_vencimento')
 
     if data_inicio:
         dt_inicio = parse_date(data_inicio)
@@ -173,21 +169,27 @@ def exportar_relatorio(request):
         if dt_fim:
             lancamentos = lancamentos.filter(data_vencimento__lte=dt_fim)
 
+    # Totais calculados pelo banco, em vez de somados linha a linha em cada formato
+    totais = lancamentos.filter(status='pago').aggregate(
+        entradas=Sum('valor', filter=Q(tipo='entrada')),
+        saidas=Sum('valor', filter=~Q(tipo='entrada')),
+    )
+    total_entradas = float(totais['entradas'] or 0)
+    total_saidas = float(totais['saidas'] or 0)
+
     if formato == 'xlsx':
+        lancamentos = lancamentos.prefetch_related('tags')
         response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
         response['Content-Disposition'] = f'attachment; filename="relatorio_tesouraria_{datetime.date.today()}.xlsx"'
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Lançamentos"
+        # write_only: as linhas vão direto para o arquivo, sem manter as células em memória
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Lançamentos")
 
         # Cabeçalhos
         headers = ['ID', 'Data', 'Tipo', 'Descrição', 'Categoria', 'Tags', 'Status', 'Valor (R$)']
         ws.append(headers)
 
-        total_entradas = 0
-        total_saidas = 0
-
         for l in lancamentos:
             tags = ", ".join([t.nome for t in l.tags.all()])
             ws.append([
@@ -200,11 +202,6 @@ def exportar_relatorio(request):
                 l.get_status_display(),
                 float(l.valor)
             ])
-            if l.status == 'pago':
-                if l.tipo == 'entrada':
-                    total_entradas += float(l.valor)
-                else:
-                    total_saidas += float(l.valor)
 
         ws.append([])
         ws.append(['', '', '', '', '', '', 'TOTAL ENTRADAS', total_entradas])
@@ -215,6 +212,11 @@ def exportar_relatorio(request):
         return response
 
     elif formato == 'pdf':
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4, landscape
+
         response = HttpResponse(content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="relatorio_tesouraria_{datetime.date.today()}.pdf"'
 
@@ -227,9 +229,6 @@ def exportar_relatorio(request):
 
         data = [['Data', 'Tipo', 'Descrição', 'Categoria', 'Status', 'Valor']]
 
-        total_entradas = 0
-        total_saidas = 0
-
         for l in lancamentos:
             data.append([
                 l.data_vencimento.strftime('%d/%m/%Y'),
@@ -239,11 +238,6 @@ def exportar_relatorio(request):
                 l.get_status_display(),
                 f"R$ {l.valor:.2f}"
             ])
-            if l.status == 'pago':
-                if l.tipo == 'entrada':
-                    total_entradas += float(l.valor)
-                else:
-                    total_saidas += float(l.valor)
 
         data.append(['', '', '', '', 'ENTRADAS', f"R$ {total_entradas:.2f}"])
         data.append(['', '', '', '', 'SAÍDAS', f"R$ {total_saidas:.2f}"])
@@ -274,15 +268,8 @@ def exportar_relatorio(request):
         writer = csv.writer(response)
         writer.writerow(['ID', 'Data', 'Tipo', 'Descrição', 'Categoria', 'Status', 'Valor (R$)'])
 
-        total_entradas = 0
-        total_saidas = 0
         for l in lancamentos:
             writer.writerow([l.id, l.data_vencimento.strftime('%d/%m/%Y'), l.get_tipo_display(), l.descricao, l.categoria.nome, l.get_status_display(), l.valor])
-            if l.status == 'pago':
-                if l.tipo == 'entrada':
-                    total_entradas += float(l.valor)
-                else:
-                    total_saidas += float(l.valor)
 
         writer.writerow([])
         writer.writerow(['', '', '', '', '', 'SALDO GERAL', total_entradas - total_saidas])
@@ -467,6 +454,28 @@ def enviar_relatorio_sede_email(request):
 # Lógica de Importação em Lote com IA (Staging Area)
 # =========================================================
 
+CABECALHOS_IMPORTACAO = [
+    "Data Vencimento", "Data Lancamento", "Descricao", "Tipo (entrada/saida)", "Valor",
+    "Forma Pagamento", "Categoria", "Impostos",
+    "Parcelado (sim/nao)", "Numero Parcelas", "Parcela Atual", "Observacoes"
+]
+COLUNAS_IMPORTACAO = {cabecalho: idx for idx, cabecalho in enumerate(CABECALHOS_IMPORTACAO)}
+
+EXEMPLO_IMPORTACAO = {
+    "Data Vencimento": "2025-01-10",
+    "Data Lancamento": "2025-01-10T10:00",
+    "Descricao": "Compra de Cadeiras",
+    "Tipo (entrada/saida)": "saida",
+    "Valor": 1500.00,
+    "Forma Pagamento": "pix",
+    "Categoria": "Móveis",
+    "Impostos": 0,
+    "Parcelado (sim/nao)": "sim",
+    "Numero Parcelas": 5,
+    "Parcela Atual": 1,
+    "Observacoes": "Loja XYZ",
+}
+
 @login_required
 @requer_permissao('tesouraria', 'ver')
 def download_template_importacao(request):
@@ -478,15 +487,13 @@ def download_template_importacao(request):
     ws = wb.active
     ws.title = "Importação"
 
-    headers = [
-        "Data Vencimento", "Data Lancamento", "Descricao", "Tipo (entrada/saida)", "Valor",
-        "Forma Pagamento", "Categoria", "Impostos",
-        "Parcelado (sim/nao)", "Numero Parcelas", "Parcela Atual", "Observacoes"
-    ]
-    ws.append(headers)
+    ws.append(CABECALHOS_IMPORTACAO)
 
-    # Example row
-    ws.append(["2025-01-10", "Compra de Cadeiras", "saida", 1500.00, "pix", "Móveis", 0, "sim", 5, 1, "Loja XYZ"])
+    # Example row (posicionada pelo nome da coluna, não pela ordem)
+    exemplo = [None] * len(CABECALHOS_IMPORTACAO)
+    for cabecalho, valor in EXEMPLO_IMPORTACAO.items():
+        exemplo[COLUNAS_IMPORTACAO[cabecalho]] = valor
+    ws.append(exemplo)
 
     wb.save(response)
     return response
@@ -544,13 +551,17 @@ def confirmar_importacao(request):
 
         from .models import CategoriaTesouraria
 
+        # Índice id -> categoria montado uma vez, em vez de uma consulta por item
+        categorias_por_id = {str(pk): cat for pk, cat in CategoriaTesouraria.objects.in_bulk().items()}
+        # Fallback genérico se a IA não mapeou e usuário não corrigiu
+        categoria_padrao = CategoriaTesouraria.objects.first()
+
         count = 0
         for item in lancamentos_session:
             cat_id = item.get('categoria_id')
-            categoria = CategoriaTesouraria.objects.filter(id=cat_id).first() if cat_id else None
+            categoria = categorias_por_id.get(str(cat_id)) if cat_id else None
             if not categoria:
-                # Fallback genérico se a IA não mapeou e usuário não corrigiu
-                categoria = CategoriaTesouraria.objects.first()
+                categoria = categoria_padrao
 
             Lancamento.objects.create(
                 tipo=item.get('tipo', 'saida'),
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.5 on 2026-10-15 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('visitantes', '0006_alter_visitaculto_nome_culto'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='visitante',
+            index=models.Index(fields=['em_acompanhamento', 'tornou_se_membro', 'desistiu', '-data_cadastro'], name='visitante_status_cadastro_idx'),
+        ),
+    ]
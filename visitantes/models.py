@@ -38,6 +38,10 @@ class Visitante(models.Model):
         verbose_name = "Visitante / Novo Convertido"
         verbose_name_plural = "Visitantes e Novos Convertidos"
         ordering = ['-data_cadastro']
+        indexes = [
+            # Listagem de visitantes ativos do dashboard (filtro + ordenação) e contagem total_ativos
+            models.Index(fields=['em_acompanhamento', 'tornou_se_membro', 'desistiu', '-data_cadastro'], name='visitante_status_cadastro_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nome_completo} ({self.tipo})"
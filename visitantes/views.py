@@ -27,7 +27,6 @@ from intranet.services.whatsapp_service import enviar_whatsapp_template
 import threading
 import os
 from io import BytesIO
-from xhtml2pdf import pisa
 
 def enviar_email_boas_vindas_background(nome, email, base_url, telefone=None):
     try:
@@ -392,6 +391,7 @@ def exportar_relatorio_geral_pdf(request):
             return os.path.join(settings.STATIC_ROOT, uri.replace(settings.STATIC_URL, ""))
         return uri
 
+    from xhtml2pdf import pisa
     result = BytesIO()
     pdf = pisa.pisaDocument(BytesIO(html_str.encode("UTF-8")), result, link_callback=fetch_resources)
 
@@ -434,6 +434,7 @@ def exportar_relatorio_individual_pdf(request, visitante_id):
             return os.path.join(settings.STATIC_ROOT, uri.replace(settings.STATIC_URL, ""))
         return uri
 
+    from xhtml2pdf import pisa
     result = BytesIO()
     pdf = pisa.pisaDocument(BytesIO(html_str.encode("UTF-8")), result, link_callback=fetch_resources)
 